@@ -1,24 +1,110 @@
 import json
 import boto3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
+import gzip
 from datetime import datetime
 import time
 import re
-from io import StringIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO, TextIOWrapper
 import os
 import psycopg2
-from psycopg2.extras import execute_batch
-from time import sleep
+from psycopg2.extras import execute_values
 from typing import Tuple, Optional
 
+# LinkedIn guest API endpoints return slim HTML fragments instead of full pages
+LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+LINKEDIN_JOB_POSTING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+# Only build the parts of each page we actually read. parse_only compares class_ against
+# the whole class attribute, so match the class as a token to keep multi-class elements
+JOB_CARD_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)base-card(\s|$)'))
+JOB_DESCRIPTION_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)show-more-less-html__markup(\s|$)'))
+
+# Location suffixes/prefixes stripped by clean_location, compiled once
+LOCATION_PATTERNS = [
+    (re.compile(r', England, United Kingdom$'), ''),
+    (re.compile(r', United Kingdom$'), ''),
+    (re.compile(r', UK$'), ''),
+    (re.compile(r' Area, United Kingdom$'), ''),
+    (re.compile(r' Area$'), ''),
+    (re.compile(r'Greater '), ''),
+]
+
+# Keyword classifiers, matched case-insensitively anywhere in the description
+SENIOR_RE = re.compile(r'senior|lead|principal|manager|head of', re.I)
+ENTRY_RE = re.compile(r'junior|entry|graduate|trainee', re.I)
+HYBRID_RE = re.compile(r'hybrid', re.I)
+REMOTE_RE = re.compile(r'remote|work from home|wfh', re.I)
+
+# Created once per container so warm invocations reuse it
+S3_CLIENT = boto3.client('s3')
+
+# Set once the tables exist so warm invocations skip the DDL
+_schema_initialized = False
+
+# Postgres connection kept open across warm invocations
+_pg_conn = None
+
+def _get_pg_conn(db_config, ping=False):
+    """Return the cached Postgres connection, reconnecting if it was closed or dropped"""
+    global _pg_conn
+    if ping and _pg_conn is not None and not _pg_conn.closed:
+        # The server may have dropped the idle connection between invocations;
+        # closed is only set after a failed query, so check it with a cheap one
+        try:
+            with _pg_conn.cursor() as cur:
+                cur.execute("SELECT 1")
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            _pg_conn.close()
+    if _pg_conn is None or _pg_conn.closed:
+        _pg_conn = psycopg2.connect(**db_config)
+    return _pg_conn
+
+# Posted-date labels LinkedIn emits for jobs within the last 3 days
+RECENT_LABELS = frozenset(
+    ['1 hour ago'] + [f'{hours} hours ago' for hours in range(2, 24)] +
+    ['1 day ago', '2 days ago', '3 days ago']
+)
+
+CSV_FIELDNAMES = ['Job Title', 'Company', 'Location', 'Latitude', 'Longitude', 
+                  'Experience Level', 'Work Type', 'Category', 'Posted Date', 
+                  'Job URL', 'Date Scraped']
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+    def __init__(self, rate, capacity):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 class LinkedInRecentITJobsScraper:
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
         
@@ -38,15 +124,37 @@ class LinkedInRecentITJobsScraper:
         }
 
         self.geocoding_cache = {}  # Simple in-memory cache
+        self.new_geocodes = {}  # Lookups not yet persisted to geocode_cache
+        self._geo_bucket = TokenBucket(rate=1.0, capacity=1)  # Nominatim allows 1 request per second
+        self._linkedin_bucket = TokenBucket(rate=5.0, capacity=5)  # Shared by page and detail fetches
+
+        # Reuse pooled connections across all HTTP calls
+        self.session = self._create_session(self.headers)
+        self.geo_session = self._create_session({
+            'User-Agent': 'LinkedInJobScraper/1.0',  # Required by Nominatim
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive',
+        })
+
+    def _create_session(self, headers):
+        """Create a requests session with connection pooling and retries"""
+        session = requests.Session()
+        session.headers.update(headers)
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Close the underlying HTTP sessions"""
+        self.session.close()
+        self.geo_session.close()
 
     def clean_location(self, location):
         """Clean location string to extract only city name"""
-        location = re.sub(r', England, United Kingdom$', '', location)
-        location = re.sub(r', United Kingdom$', '', location)
-        location = re.sub(r', UK$', '', location)
-        location = re.sub(r' Area, United Kingdom$', '', location)
-        location = re.sub(r' Area$', '', location)
-        location = re.sub(r'Greater ', '', location)
+        for pattern, replacement in LOCATION_PATTERNS:
+            location = pattern.sub(replacement, location)
         
         if ',' in location:
             location = location.split(',')[0].strip()
@@ -55,38 +163,29 @@ class LinkedInRecentITJobsScraper:
 
     def determine_experience_level(self, job_description):
         """Determine if the job is entry-level, mid-level, or senior"""
-        text = job_description.lower()
-        
-        if any(word in text for word in ['senior', 'lead', 'principal', 'manager', 'head of']):
+        if SENIOR_RE.search(job_description):
             return 'Senior Level'
-        elif any(word in text for word in ['junior', 'entry', 'graduate', 'trainee']):
+        elif ENTRY_RE.search(job_description):
             return 'Entry Level'
         else:
             return 'Mid Level'
 
     def is_remote(self, job_description):
         """Check if the job is remote"""
-        text = job_description.lower()
-        if any(word in text for word in ['remote', 'work from home', 'wfh', 'hybrid']):
-            if 'hybrid' in text:
-                return 'Hybrid'
+        if HYBRID_RE.search(job_description):
+            return 'Hybrid'
+        elif REMOTE_RE.search(job_description):
             return 'Remote'
         return 'On-site'
 
     def is_recent_job(self, posted_date_text):
         """Check if the job was posted recently (within last 3 days)"""
-        text = posted_date_text.lower()
-        
-        if 'hours ago' in text or 'hour ago' in text:
-            return True
-        elif 'day ago' in text or '1 day ago' in text:
-            return True
-        elif '2 days ago' in text:
-            return True
-        elif '3 days ago' in text:
+        text = posted_date_text.strip().lower()
+        if text in RECENT_LABELS:
             return True
         
-        return False
+        # Fall back to looser matching for other phrasings
+        return 'hour' in text or text.startswith(('1 day', '2 day', '3 day'))
 
     def get_coordinates(self, location: str) -> Tuple[Optional[float], Optional[float]]:
         """Get latitude and longitude for a location using Nominatim (OpenStreetMap)"""
@@ -98,31 +197,29 @@ class LinkedInRecentITJobsScraper:
             return self.geocoding_cache[location]
             
         try:
-            # Add UK to the location query to improve accuracy
-            search_location = f"{location}, United Kingdom"
-            
-            # Using Nominatim API
+            # Using Nominatim API with a structured query restricted to the UK, falling back
+            # to free text for region-level labels such as "England" or county names
             url = "https://nominatim.openstreetmap.org/search"
-            headers = {
-                'User-Agent': 'LinkedInJobScraper/1.0',  # Required by Nominatim
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-            params = {
-                'q': search_location,
-                'format': 'json',
-                'limit': 1
-            }
+            queries = [
+                {'city': location, 'country': 'United Kingdom'},
+                {'q': f"{location}, United Kingdom"},
+            ]
             
-            response = requests.get(url, headers=headers, params=params)
-            sleep(1)  # Respect rate limit - 1 request per second
-            
-            if response.status_code == 200:
+            for query in queries:
+                params = {**query, 'format': 'json', 'limit': 1}
+                
+                self._geo_bucket.acquire()  # Respect rate limit - 1 request per second
+                response = self.geo_session.get(url, params=params, timeout=10)
+                if response.status_code != 200:
+                    break
+                
                 results = response.json()
                 if results:
                     lat = float(results[0]['lat'])
                     lon = float(results[0]['lon'])
                     # Cache the result
                     self.geocoding_cache[location] = (lat, lon)
+                    self.new_geocodes[location] = (lat, lon)
                     return lat, lon
             
             # Cache negative result
@@ -133,6 +230,132 @@ class LinkedInRecentITJobsScraper:
             print(f"Error geocoding location '{location}': {str(e)}")
             return None, None
 
+    def ensure_schema(self, conn):
+        """Create the database tables once per Lambda container"""
+        global _schema_initialized
+        if _schema_initialized:
+            return
+        
+        with conn.cursor() as cur:
+            # Modified table creation to include latitude and longitude
+            create_table_query = """
+            CREATE TABLE IF NOT EXISTS linkedin_jobs (
+                id SERIAL PRIMARY KEY,
+                job_title VARCHAR(255),
+                company VARCHAR(255),
+                location VARCHAR(255),
+                latitude DECIMAL(10, 8),
+                longitude DECIMAL(11, 8),
+                experience_level VARCHAR(50),
+                work_type VARCHAR(50),
+                category VARCHAR(100),
+                posted_date VARCHAR(100),
+                job_url TEXT,
+                date_scraped TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+            cur.execute(create_table_query)
+            
+            # Add unique constraint if it doesn't exist
+            cur.execute("""
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'unique_job_url' AND conrelid = 'linkedin_jobs'::regclass
+            """)
+            if cur.fetchone() is None:
+                cur.execute("""
+                    ALTER TABLE linkedin_jobs 
+                    ADD CONSTRAINT unique_job_url UNIQUE (job_url);
+                """)
+            
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                location TEXT PRIMARY KEY,
+                lat DOUBLE PRECISION,
+                lon DOUBLE PRECISION,
+                updated_at TIMESTAMP DEFAULT now()
+            );
+            """)
+        conn.commit()
+        _schema_initialized = True
+
+    def load_geocoding_cache(self):
+        """Hydrate the geocoding cache from the geocode_cache table"""
+        conn = None
+        cur = None
+        try:
+            # First database call of each invocation, so validate the cached connection here
+            conn = _get_pg_conn(self.db_config, ping=True)
+            self.ensure_schema(conn)
+            cur = conn.cursor()
+            cur.execute("SELECT location, lat, lon FROM geocode_cache")
+            for location, lat, lon in cur.fetchall():
+                self.geocoding_cache[location] = (lat, lon)
+            conn.commit()  # Don't leave the shared connection idle in a transaction
+            
+            print(f"Loaded {len(self.geocoding_cache)} cached locations")
+            
+        except Exception as e:
+            print(f"Error loading geocoding cache: {str(e)}")
+            if conn and not conn.closed:
+                conn.rollback()
+        finally:
+            if cur:
+                cur.close()
+
+    def save_geocoding_cache(self):
+        """Persist new geocoding results to the geocode_cache table"""
+        if not self.new_geocodes:
+            return
+        
+        conn = None
+        cur = None
+        try:
+            conn = _get_pg_conn(self.db_config)
+            cur = conn.cursor()
+            execute_values(
+                cur,
+                "INSERT INTO geocode_cache (location, lat, lon) VALUES %s ON CONFLICT (location) DO NOTHING",
+                [(location, lat, lon) for location, (lat, lon) in self.new_geocodes.items()]
+            )
+            conn.commit()
+            
+            print(f"Cached {len(self.new_geocodes)} new locations")
+            self.new_geocodes = {}
+            
+        except Exception as e:
+            print(f"Error saving geocoding cache: {str(e)}")
+            if conn and not conn.closed:
+                conn.rollback()
+        finally:
+            if cur:
+                cur.close()
+
+    def geocode_all(self, jobs):
+        """Geocode every unique job location once, populating the geocoding cache"""
+        unique_locations = {job['Location'] for job in jobs} - self.geocoding_cache.keys()
+        if not unique_locations:
+            return
+        
+        print(f"Geocoding {len(unique_locations)} unique locations...")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(self.get_coordinates, unique_locations))
+
+    def attach_coordinates(self, jobs):
+        """Add Latitude and Longitude to each job in place"""
+        self.geocode_all(jobs)
+        for job in jobs:
+            job['Latitude'], job['Longitude'] = self.geocoding_cache.get(job['Location'], (None, None))
+
+    def fetch_job_page(self, job_url):
+        """Fetch the raw HTML of a job detail page"""
+        try:
+            self._linkedin_bucket.acquire()
+            return self.session.get(job_url, timeout=10).content
+        except Exception as e:
+            print(f"Error fetching job page '{job_url}': {str(e)}")
+            return None
+
     def scrape_linkedin_jobs(self):
         """Scrape recent IT jobs from LinkedIn UK"""
         all_jobs = []
@@ -146,15 +369,16 @@ class LinkedInRecentITJobsScraper:
             while page < max_pages_per_category:
                 try:
                     encoded_title = requests.utils.quote(job_title)
-                    url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_title}&location=United%20Kingdom&start={page*25}&f_TPR=r86400"
+                    url = f"{LINKEDIN_SEARCH_URL}?keywords={encoded_title}&location=United%20Kingdom&start={page*25}&f_TPR=r86400"
                     print(f"Scraping page {page + 1}...")
                     
-                    response = requests.get(url, headers=self.headers)
+                    self._linkedin_bucket.acquire()
+                    response = self.session.get(url, timeout=10)
                     if response.status_code != 200:
                         print(f"Failed to fetch page {page + 1}. Status code: {response.status_code}")
                         break
                     
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = BeautifulSoup(response.content, 'lxml', parse_only=JOB_CARD_STRAINER)
                     job_cards = soup.find_all('div', class_='base-card')
                     
                     if not job_cards:
@@ -163,25 +387,44 @@ class LinkedInRecentITJobsScraper:
                     
                     recent_jobs_found = False
                     
+                    # Collect card details first so detail pages can be fetched concurrently
+                    cards = []
                     for job in job_cards:
                         try:
                             posted_date = job.find('time', class_='job-search-card__listdate')
-                            if posted_date:
-                                posted_date_text = posted_date.text.strip()
-                                if not self.is_recent_job(posted_date_text):
-                                    continue
+                            posted_date_text = posted_date.get_text(strip=True) if posted_date else 'Recently'
+                            if posted_date and not self.is_recent_job(posted_date_text):
+                                continue
                                 
                             recent_jobs_found = True
                             
-                            title = job.find('h3', class_='base-search-card__title').text.strip()
-                            company = job.find('h4', class_='base-search-card__subtitle').text.strip()
-                            raw_location = job.find('span', class_='job-search-card__location').text.strip()
+                            title = job.find('h3', class_='base-search-card__title').get_text(strip=True)
+                            company = job.find('h4', class_='base-search-card__subtitle').get_text(strip=True)
+                            raw_location = job.find('span', class_='job-search-card__location').get_text(strip=True)
                             location = self.clean_location(raw_location)
                             job_url = job.find('a', class_='base-card__full-link')['href']
                             
-                            job_response = requests.get(job_url, headers=self.headers)
-                            job_soup = BeautifulSoup(job_response.text, 'html.parser')
-                            job_description = job_soup.find('div', class_='show-more-less-html__markup').text.strip() if job_soup.find('div', class_='show-more-less-html__markup') else ""
+                            # Fetch the description fragment by job id, falling back to the full page
+                            job_id = job.get('data-entity-urn', '').rsplit(':', 1)[-1]
+                            detail_url = LINKEDIN_JOB_POSTING_URL.format(job_id=job_id) if job_id else job_url
+                            
+                            cards.append((title, company, location, job_url, detail_url, posted_date_text))
+                            
+                        except Exception as e:
+                            print(f"Error parsing job: {str(e)}")
+                            continue
+                    
+                    with ThreadPoolExecutor(max_workers=8) as executor:
+                        job_pages = list(executor.map(self.fetch_job_page, [card[4] for card in cards]))
+                    
+                    for (title, company, location, job_url, _, posted_date_text), job_page in zip(cards, job_pages):
+                        if job_page is None:
+                            continue
+                        
+                        try:
+                            job_soup = BeautifulSoup(job_page, 'lxml', parse_only=JOB_DESCRIPTION_STRAINER)
+                            description_element = job_soup.find('div', class_='show-more-less-html__markup')
+                            job_description = description_element.get_text(' ', strip=True) if description_element else ""
                             
                             experience_level = self.determine_experience_level(job_description)
                             work_type = self.is_remote(job_description)
@@ -193,9 +436,9 @@ class LinkedInRecentITJobsScraper:
                                 'Experience Level': experience_level,
                                 'Work Type': work_type,
                                 'Category': job_title,
-                                'Posted Date': posted_date_text if posted_date else 'Recently',
+                                'Posted Date': posted_date_text,
                                 'Job URL': job_url,
-                                'Date Scraped': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                'Date Scraped': datetime.now().replace(microsecond=0)  # Written as 'YYYY-MM-DD HH:MM:SS'
                             })
                             
                         except Exception as e:
@@ -210,7 +453,6 @@ class LinkedInRecentITJobsScraper:
                         consecutive_old_jobs = 0
                     
                     page += 1
-                    time.sleep(1)  # Reduced sleep time for Lambda
                     
                 except Exception as e:
                     print(f"Error fetching page: {str(e)}")
@@ -218,6 +460,31 @@ class LinkedInRecentITJobsScraper:
         
         return all_jobs
 
+    def _write_csv(self, stream, jobs, header=True):
+        """Write jobs to a text stream as CSV in CSV_FIELDNAMES order"""
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDNAMES)
+        if header:
+            writer.writeheader()
+        writer.writerows(jobs)
+
+    def _build_csv(self, jobs, header=True):
+        """Write jobs to an in-memory CSV buffer"""
+        csv_buffer = StringIO()
+        self._write_csv(csv_buffer, jobs, header)
+        csv_buffer.seek(0)
+        return csv_buffer
+
+    def _build_gzipped_csv(self, jobs):
+        """Write jobs to an in-memory gzip-compressed CSV buffer"""
+        gzip_buffer = BytesIO()
+        with gzip.GzipFile(fileobj=gzip_buffer, mode='wb') as gz:
+            text = TextIOWrapper(gz, encoding='utf-8', newline='')
+            self._write_csv(text, jobs)
+            text.flush()
+            text.detach()
+        gzip_buffer.seek(0)
+        return gzip_buffer
+
     def save_to_s3(self, jobs):
         """Save jobs to CSV file in S3"""
         if not jobs:
@@ -225,37 +492,19 @@ class LinkedInRecentITJobsScraper:
             return
         
         try:
-            # Create CSV in memory
-            csv_buffer = StringIO()
-            fieldnames = ['Job Title', 'Company', 'Location', 'Latitude', 'Longitude', 
-                         'Experience Level', 'Work Type', 'Category', 'Posted Date', 
-                         'Job URL', 'Date Scraped']
-            
-            # Add coordinates to jobs data
-            jobs_with_coordinates = []
-            for job in jobs:
-                job_copy = job.copy()
-                lat, lng = self.get_coordinates(job['Location'])
-                job_copy['Latitude'] = lat
-                job_copy['Longitude'] = lng
-                jobs_with_coordinates.append(job_copy)
-                time.sleep(0.1)  # Rate limiting
-            
-            writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(jobs_with_coordinates)
+            # Create compressed CSV in memory
+            gzip_buffer = self._build_gzipped_csv(jobs)
             
             # Upload to S3
-            s3 = boto3.client('s3')
             bucket_name = os.environ['S3_BUCKET_NAME']
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f'linkedin_recent_it_jobs_{timestamp}.csv'
+            file_name = f'linkedin_recent_it_jobs_{timestamp}.csv.gz'
             
-            s3.put_object(
-                Bucket=bucket_name,
-                Key=file_name,
-                Body=csv_buffer.getvalue(),
-                ContentType='text/csv'
+            S3_CLIENT.upload_fileobj(
+                gzip_buffer,
+                bucket_name,
+                file_name,
+                ExtraArgs={'ContentType': 'text/csv', 'ContentEncoding': 'gzip'}
             )
             
             print(f"\nSaved {len(jobs)} jobs to S3: {bucket_name}/{file_name}")
@@ -275,89 +524,63 @@ class LinkedInRecentITJobsScraper:
         cur = None
         try:
             print("Connecting to database...")
-            conn = psycopg2.connect(**self.db_config)
+            conn = _get_pg_conn(self.db_config)
+            self.ensure_schema(conn)
             cur = conn.cursor()
             
-            # Modified table creation to include latitude and longitude
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS linkedin_jobs (
-                id SERIAL PRIMARY KEY,
-                job_title VARCHAR(255),
-                company VARCHAR(255),
-                location VARCHAR(255),
-                latitude DECIMAL(10, 8),
-                longitude DECIMAL(11, 8),
-                experience_level VARCHAR(50),
-                work_type VARCHAR(50),
-                category VARCHAR(100),
-                posted_date VARCHAR(100),
-                job_url TEXT,
-                date_scraped TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-            cur.execute(create_table_query)
+            # Bulk load into a staging table, then dedupe into linkedin_jobs
+            cur.execute("""
+                CREATE TEMP TABLE linkedin_jobs_stage ON COMMIT DROP AS
+                SELECT job_title, company, location, latitude, longitude, experience_level, work_type, 
+                       category, posted_date, job_url, date_scraped
+                FROM linkedin_jobs WITH NO DATA
+            """)
             
-            # Add unique constraint if it doesn't exist
-            try:
-                cur.execute("""
-                    ALTER TABLE linkedin_jobs 
-                    ADD CONSTRAINT unique_job_url UNIQUE (job_url);
-                """)
-            except psycopg2.errors.DuplicateTable:
-                conn.rollback()
-            
-            conn.commit()
+            csv_buffer = self._build_csv(jobs, header=False)
+            cur.copy_expert("""
+                COPY linkedin_jobs_stage
+                (job_title, company, location, latitude, longitude, experience_level, work_type, 
+                 category, posted_date, job_url, date_scraped)
+                FROM STDIN WITH (
+                    FORMAT CSV,
+                    FORCE_NOT_NULL (job_title, company, location, experience_level, work_type, 
+                                    category, posted_date, job_url)
+                )
+            """, csv_buffer)
             
-            insert_query = """
+            cur.execute("""
                 INSERT INTO linkedin_jobs 
                 (job_title, company, location, latitude, longitude, experience_level, work_type, 
                  category, posted_date, job_url, date_scraped)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                SELECT job_title, company, location, latitude, longitude, experience_level, work_type, 
+                       category, posted_date, job_url, date_scraped
+                FROM linkedin_jobs_stage
                 ON CONFLICT (job_url) DO NOTHING
-            """
-            
-            # Modify job data to include coordinates
-            job_data = []
-            for job in jobs:
-                lat, lng = self.get_coordinates(job['Location'])
-                job_data.append((
-                    job['Job Title'],
-                    job['Company'],
-                    job['Location'],
-                    lat,
-                    lng,
-                    job['Experience Level'],
-                    job['Work Type'],
-                    job['Category'],
-                    job['Posted Date'],
-                    job['Job URL'],
-                    datetime.strptime(job['Date Scraped'], "%Y-%m-%d %H:%M:%S")
-                ))
-                # Add a small delay to avoid hitting API rate limits
-                time.sleep(0.1)
-            
-            execute_batch(cur, insert_query, job_data)
+            """)
             conn.commit()
             
             print(f"\nSaved {len(jobs)} jobs to PostgreSQL database")
             
         except Exception as e:
             print(f"Error saving to PostgreSQL: {str(e)}")
-            if conn:
+            if conn and not conn.closed:
                 conn.rollback()
         finally:
             if cur:
                 cur.close()
-            if conn:
-                conn.close()
 
 def lambda_handler(event, context):
+    scraper = None
     try:
         print("Starting LinkedIn job scraper...")
         scraper = LinkedInRecentITJobsScraper()
         jobs = scraper.scrape_linkedin_jobs()
         
+        # Geocode unique locations once for both save paths
+        scraper.load_geocoding_cache()
+        scraper.attach_coordinates(jobs)
+        scraper.save_geocoding_cache()
+        
         # Save to S3
         s3_path = scraper.save_to_s3(jobs)
         
@@ -392,4 +615,7 @@ def lambda_handler(event, context):
                 'error': str(e)
             })
         }
+    finally:
+        if scraper:
+            scraper.close()
 
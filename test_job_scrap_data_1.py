@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+pytest.importorskip('boto3')
+pytest.importorskip('psycopg2')
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-2')
+
+from bs4 import BeautifulSoup
+
+from job_scrap_data_1 import JOB_CARD_STRAINER, JOB_DESCRIPTION_STRAINER
+
+SEARCH_FRAGMENT = b"""
+<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card"
+       data-entity-urn="urn:li:jobPosting:4012345678">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]"
+       href="https://uk.linkedin.com/jobs/view/backend-developer-at-acme-4012345678"></a>
+    <h3 class="base-search-card__title">Backend Developer</h3>
+    <h4 class="base-search-card__subtitle"><a href="#">Acme Ltd</a></h4>
+    <span class="job-search-card__location">London, England, United Kingdom</span>
+    <time class="job-search-card__listdate--new job-search-card__listdate" datetime="2026-10-14">2 hours ago</time>
+  </div>
+</li>
+<li>
+  <div class="base-card">
+    <h3 class="base-search-card__title">Frontend Developer</h3>
+  </div>
+</li>
+<li><div class="other-card">Ignored</div></li>
+"""
+
+JOB_POSTING_FRAGMENT = b"""
+<section class="core-section-container">
+  <div class="show-more-less-html__markup show-more-less-html__markup--clamp-after-5 relative overflow-hidden">
+    <p>We are hiring a <strong>Senior</strong> engineer.</p><p>Hybrid working from London.</p>
+  </div>
+</section>
+"""
+
+
+def test_card_strainer_keeps_multi_class_cards():
+    soup = BeautifulSoup(SEARCH_FRAGMENT, 'lxml', parse_only=JOB_CARD_STRAINER)
+    cards = soup.find_all('div', class_='base-card')
+
+    assert len(cards) == 2
+    assert cards[0]['data-entity-urn'] == 'urn:li:jobPosting:4012345678'
+    assert cards[0].find('h3', class_='base-search-card__title').get_text(strip=True) == 'Backend Developer'
+    assert cards[0].find('time', class_='job-search-card__listdate').get_text(strip=True) == '2 hours ago'
+
+
+def test_description_strainer_keeps_multi_class_markup():
+    soup = BeautifulSoup(JOB_POSTING_FRAGMENT, 'lxml', parse_only=JOB_DESCRIPTION_STRAINER)
+    description = soup.find('div', class_='show-more-less-html__markup')
+
+    assert description is not None
+    assert description.get_text(' ', strip=True) == 'We are hiring a Senior engineer. Hybrid working from London.'